@@ -4,15 +4,20 @@ Gestión de conexión y operaciones con la base de datos SQLite
 
 import sqlite3
 import os
-from typing import Optional
-from functools import lru_cache
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Optional
 
 # ============================================================================
 # CONFIGURACIÓN
 # ============================================================================
 
 DB_FILE = 'passwords.db'
-DB_CONNECTION = None
+
+# Diccionario en memoria: password_lower -> rank
+COMMON_PW: Dict[str, int] = {}
+# Longitud de la entrada más larga del diccionario
+COMMON_PW_MAX_LENGTH = 0
 
 # ============================================================================
 # GESTIÓN DE CONEXIÓN
@@ -20,27 +25,34 @@ DB_CONNECTION = None
 
 def get_db_connection() -> sqlite3.Connection:
     """
-    Obtiene una conexión optimizada a SQLite
+    Obtiene una conexión de solo lectura optimizada a SQLite
     
     Returns:
         sqlite3.Connection: Conexión a la base de datos
     """
-    conn = sqlite3.connect(DB_FILE, check_same_thread=False)
-    # Optimizaciones para lectura
-    conn.execute('PRAGMA journal_mode=WAL')  # Write-Ahead Logging
-    conn.execute('PRAGMA synchronous=NORMAL')
-    conn.execute('PRAGMA cache_size=10000')  # Cache de 10MB
-    conn.execute('PRAGMA temp_store=MEMORY')
+    # Solo lectura e inmutable: SQLite omite el bloqueo de archivos y el WAL
+    uri = f"{Path(DB_FILE).resolve().as_uri()}?mode=ro&immutable=1"
+    conn = sqlite3.connect(uri, uri=True)
+    # Optimizaciones para lectura (un solo lote)
+    conn.executescript(
+        'PRAGMA query_only=1;'
+        'PRAGMA mmap_size=268435456;'  # Lectura vía mmap (256MB)
+        'PRAGMA cache_size=10000;'  # Cache de 10MB
+        'PRAGMA temp_store=MEMORY;'
+    )
     return conn
 
 def init_database() -> bool:
     """
-    Inicializa la conexión a la base de datos
+    Carga el diccionario de contraseñas desde la base de datos
+    
+    La conexión solo se usa durante la carga y se cierra al terminar:
+    las consultas posteriores no acceden a SQLite.
     
     Returns:
         bool: True si la inicialización fue exitosa, False en caso contrario
     """
-    global DB_CONNECTION
+    global COMMON_PW, COMMON_PW_MAX_LENGTH
     
     if not os.path.exists(DB_FILE):
         print(f"⚠️  Base de datos '{DB_FILE}' no encontrada.")
@@ -48,32 +60,39 @@ def init_database() -> bool:
         return False
     
     try:
-        DB_CONNECTION = get_db_connection()
-        cursor = DB_CONNECTION.cursor()
-        cursor.execute("SELECT COUNT(*) FROM passwords")
-        total = cursor.fetchone()[0]
-        print(f"✅ Base de datos conectada: {total:,} contraseñas cargadas")
+        with closing(get_db_connection()) as conn:
+            # Precargar el diccionario completo en una sola consulta: las
+            # búsquedas posteriores son una consulta a un dict, sin pasar
+            # por SQLite. Orden descendente para que, ante duplicados en
+            # minúsculas, prevalezca el rank más bajo.
+            cursor = conn.execute(
+                'SELECT password_lower, rank FROM passwords ORDER BY rank DESC'
+            )
+            COMMON_PW = dict(cursor)
+        COMMON_PW_MAX_LENGTH = max(map(len, COMMON_PW), default=0)
+        
+        print(f"✅ Base de datos conectada: {len(COMMON_PW):,} contraseñas cargadas")
         return True
     except Exception as e:
         print(f"❌ Error al conectar con la base de datos: {e}")
         return False
 
 def close_database() -> None:
-    """Cierra la conexión a la base de datos"""
-    global DB_CONNECTION
-    if DB_CONNECTION:
-        DB_CONNECTION.close()
-        print("🔌 Conexión a base de datos cerrada")
+    """Libera el diccionario de contraseñas cargado en memoria"""
+    global COMMON_PW, COMMON_PW_MAX_LENGTH
+    if COMMON_PW:
+        COMMON_PW = {}
+        COMMON_PW_MAX_LENGTH = 0
+        print("🔌 Diccionario de contraseñas liberado")
 
 # ============================================================================
 # OPERACIONES DE CONSULTA
 # ============================================================================
 
-@lru_cache(maxsize=10000)
 def is_common_password(password: str) -> bool:
     """
     Verifica si la contraseña está en el diccionario
-    Usa cache LRU para mejorar rendimiento en búsquedas repetidas
+    Consulta el diccionario precargado en memoria
     
     Args:
         password (str): Contraseña a verificar
@@ -81,19 +100,7 @@ def is_common_password(password: str) -> bool:
     Returns:
         bool: True si la contraseña es común, False en caso contrario
     """
-    if not DB_CONNECTION:
-        return False
-    
-    try:
-        cursor = DB_CONNECTION.cursor()
-        cursor.execute(
-            'SELECT 1 FROM passwords WHERE password_lower = ? LIMIT 1',
-            (password.lower(),)
-        )
-        return cursor.fetchone() is not None
-    except Exception as e:
-        print(f"Error en búsqueda de contraseña: {e}")
-        return False
+    return lookup_password_rank(password) is not None
 
 def get_password_rank(password: str) -> Optional[int]:
     """
@@ -105,32 +112,23 @@ def get_password_rank(password: str) -> Optional[int]:
     Returns:
         Optional[int]: Rank de la contraseña o None si no existe
     """
-    if not DB_CONNECTION:
-        return None
-    
-    try:
-        cursor = DB_CONNECTION.cursor()
-        cursor.execute(
-            'SELECT rank FROM passwords WHERE password_lower = ?',
-            (password.lower(),)
-        )
-        result = cursor.fetchone()
-        return result[0] if result else None
-    except Exception as e:
-        print(f"Error al obtener rank: {e}")
-        return None
+    return lookup_password_rank(password)
 
-def get_cache_info() -> dict:
+def lookup_password_rank(password: str) -> Optional[int]:
     """
-    Obtiene información sobre el cache LRU
+    Busca la contraseña en el diccionario con una sola consulta
+    
+    Es el único punto donde se normaliza la contraseña a minúsculas,
+    de modo que cada evaluación hace una sola llamada a str.lower().
+    
+    Args:
+        password (str): Contraseña a buscar
     
     Returns:
-        dict: Estadísticas del cache
+        Optional[int]: Rank de la contraseña o None si no es común
     """
-    cache_info = is_common_password.cache_info()
-    return {
-        "hits": cache_info.hits,
-        "misses": cache_info.misses,
-        "size": cache_info.currsize,
-        "maxsize": cache_info.maxsize
-    }
\ No newline at end of file
+    # Filtro negativo: str.lower() nunca acorta el texto, así que una
+    # contraseña más larga que cualquier entrada no puede ser común
+    if len(password) > COMMON_PW_MAX_LENGTH:
+        return None
+    return COMMON_PW.get(password.lower())
@@ -5,6 +5,8 @@ FastAPI con arquitectura modular separada
 
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
 
 from models.models import (
@@ -12,7 +14,7 @@ from models.models import (
     PasswordResponse,
     ErrorResponse
 )
-from services.services import evaluate_password
+from services.services import evaluate_password, clear_evaluation_cache
 from database.database import init_database, close_database
 
 
@@ -24,11 +26,15 @@ async def lifespan(app: FastAPI):
     print("🚀 Iniciando Password Entropy Evaluation API")
     print("="*60)
     
-    if not init_database():
+    # La carga del diccionario es E/S bloqueante: se ejecuta fuera del event loop
+    if not await run_in_threadpool(init_database):
         print("\n❌ No se pudo iniciar la API")
         print("   Ejecuta primero: python migrate_csv_to_sqlite.py\n")
         raise RuntimeError("Base de datos no disponible")
     
+    # Las evaluaciones en cache dependen del diccionario cargado
+    clear_evaluation_cache()
+    
     print("\n📚 Documentación Swagger disponible en: http://localhost:8000/docs")
     print("📚 Documentación ReDoc disponible en: http://localhost:8000/redoc")
     print("="*60 + "\n")
@@ -37,6 +43,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     close_database()
+    clear_evaluation_cache()
 
 
 app = FastAPI(
@@ -77,8 +84,11 @@ app = FastAPI(
     
     ### 🔒 Seguridad
     
-    Esta API **NO almacena ni registra** las contraseñas enviadas.
-    Todas las evaluaciones se realizan en memoria y se descartan inmediatamente.
+    Esta API **NO almacena ni registra** las contraseñas enviadas (ni hashes de ellas).
+    Los resultados de las contraseñas que no están en el diccionario se guardan
+    en una cache en memoria indexada solo por longitud y tipos de caracteres
+    (como máximo 2.048 entradas, ~6MB, mientras el proceso esté activo).
+    Las evaluaciones de contraseñas del diccionario no se guardan.
     
     ### 📚 Proyecto Académico
     
@@ -96,6 +106,7 @@ app = FastAPI(
     license_info={
         "name": "MIT License",
     },
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -112,6 +123,26 @@ app.add_middleware(
 # ENDPOINTS
 # ============================================================================
 
+# Información general de la API (constante: se construye una sola vez)
+ROOT_INFO = {
+    "name": "Password Entropy Evaluation API",
+    "version": "1.0.0",
+    "description": "API para evaluar la fortaleza de contraseñas mediante cálculo de entropía",
+    "documentation": {
+        "swagger": "/docs",
+        "redoc": "/redoc",
+        "openapi": "/openapi.json"
+    },
+    "endpoint": "/api/v1/password/evaluate (POST)",
+    "features": [
+        "Cálculo de entropía (E = L × log₂(N))",
+        "Validación contra 1M de contraseñas comunes",
+        "Estimación de tiempo de crackeo",
+        "Análisis de composición",
+        "Zero storage (no guarda contraseñas; cache solo por longitud y composición)"
+    ]
+}
+
 @app.get(
     "/",
     summary="Información de la API",
@@ -119,24 +150,10 @@ app.add_middleware(
 )
 async def root():
     """Endpoint raíz con información general de la API"""
-    return {
-        "name": "Password Entropy Evaluation API",
-        "version": "1.0.0",
-        "description": "API para evaluar la fortaleza de contraseñas mediante cálculo de entropía",
-        "documentation": {
-            "swagger": "/docs",
-            "redoc": "/redoc",
-            "openapi": "/openapi.json"
-        },
-        "endpoint": "/api/v1/password/evaluate (POST)",
-        "features": [
-            "Cálculo de entropía (E = L × log₂(N))",
-            "Validación contra 1M de contraseñas comunes",
-            "Estimación de tiempo de crackeo",
-            "Análisis de composición",
-            "Zero storage (no guarda contraseñas)"
-        ]
-    }
+    return ORJSONResponse(
+        ROOT_INFO,
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
 
 @app.post(
     "/api/v1/password/evaluate",
@@ -210,8 +227,11 @@ async def root():
     
     ### ⚠️ Importante:
     
-    Esta API **NO almacena ni registra** las contraseñas enviadas.
-    Todas las evaluaciones se realizan en memoria y los datos se descartan inmediatamente.
+    Esta API **NO almacena ni registra** las contraseñas enviadas (ni hashes de ellas).
+    Los resultados de las contraseñas que no están en el diccionario se guardan
+    en una cache en memoria indexada solo por longitud y tipos de caracteres
+    (como máximo 2.048 entradas, ~6MB, mientras el proceso esté activo).
+    Las evaluaciones de contraseñas del diccionario no se guardan.
     """,
     tags=["Evaluación"]
 )
@@ -231,10 +251,12 @@ async def evaluate_password_endpoint(request: PasswordRequest):
         evaluation = evaluate_password(request.password)
         
         # Retornar respuesta exitosa
-        return PasswordResponse(
-            success=True,
-            evaluation=evaluation
-        )
+        # Se devuelve la respuesta directamente: FastAPI no la revalida
+        # contra response_model (que solo se usa para la documentación)
+        return ORJSONResponse({
+            "success": True,
+            "evaluation": evaluation.model_dump()
+        })
         
     except Exception as e:
         # Log del error (en producción usar logging apropiado)
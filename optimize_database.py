@@ -0,0 +1,85 @@
+"""
+Reconstruye la base de datos de contraseñas en un formato compacto
+
+La tabla original (id, rank, password, password_lower) con dos índices se
+reemplaza por una tabla WITHOUT ROWID con clave primaria password_lower:
+cada hoja del B-tree contiene directamente el rank, sin índices aparte.
+Ante duplicados en minúsculas se conserva el rank más bajo.
+
+Uso:
+    python optimize_database.py
+"""
+
+import os
+import sqlite3
+
+from database.database import DB_FILE
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+TMP_FILE = DB_FILE + '.tmp'
+
+# ============================================================================
+# RECONSTRUCCIÓN
+# ============================================================================
+
+def optimize_database() -> bool:
+    """
+    Copia el diccionario a una tabla WITHOUT ROWID y reemplaza el archivo
+
+    Returns:
+        bool: True si la reconstrucción fue exitosa, False en caso contrario
+    """
+    if not os.path.exists(DB_FILE):
+        print(f"⚠️  Base de datos '{DB_FILE}' no encontrada.")
+        return False
+
+    if os.path.exists(TMP_FILE):
+        os.remove(TMP_FILE)
+
+    conn = sqlite3.connect(TMP_FILE)
+    try:
+        conn.execute('PRAGMA page_size=4096')
+        conn.execute('ATTACH DATABASE ? AS src', (DB_FILE,))
+        conn.execute(
+            'CREATE TABLE passwords ('
+            'password_lower TEXT PRIMARY KEY, '
+            'rank INTEGER NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        conn.execute(
+            'INSERT INTO passwords (password_lower, rank) '
+            'SELECT password_lower, MIN(rank) FROM src.passwords '
+            'GROUP BY password_lower'
+        )
+        conn.commit()
+        conn.execute('DETACH DATABASE src')
+        conn.execute('ANALYZE')
+        conn.execute('VACUUM')
+        total = conn.execute('SELECT COUNT(*) FROM passwords').fetchone()[0]
+    except Exception as e:
+        conn.close()
+        os.remove(TMP_FILE)
+        print(f"❌ Error al reconstruir la base de datos: {e}")
+        return False
+    conn.close()
+
+    before = os.path.getsize(DB_FILE)
+    os.replace(TMP_FILE, DB_FILE)
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(DB_FILE + suffix):
+            os.remove(DB_FILE + suffix)
+    after = os.path.getsize(DB_FILE)
+
+    print(f"✅ Base de datos reconstruida: {total:,} contraseñas")
+    print(f"   Tamaño: {before / 2**20:.1f}MB → {after / 2**20:.1f}MB")
+    return True
+
+# ============================================================================
+# EJECUCIÓN
+# ============================================================================
+
+if __name__ == "__main__":
+    optimize_database()
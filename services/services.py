@@ -3,8 +3,98 @@ Servicios de lógica de negocio para evaluación de contraseñas
 """
 
 import math
+import string
+from bisect import bisect_right
+from typing import Dict, Tuple
 from models.models import PasswordEvaluation, CompositionInfo, CrackTime
-from database.database import is_common_password, get_password_rank
+from database.database import lookup_password_rank
+
+# ============================================================================
+# CLASIFICACIÓN DE CARACTERES
+# ============================================================================
+
+# Bits de la máscara de composición
+MASK_LOWERCASE = 1
+MASK_UPPERCASE = 2
+MASK_DIGITS = 4
+MASK_SYMBOLS = 8
+
+ASCII_CHARS = frozenset(chr(i) for i in range(128))
+ASCII_LOWERCASE = frozenset(string.ascii_lowercase)
+ASCII_UPPERCASE = frozenset(string.ascii_uppercase)
+ASCII_DIGITS = frozenset(string.digits)
+ASCII_SYMBOLS = ASCII_CHARS - ASCII_LOWERCASE - ASCII_UPPERCASE - ASCII_DIGITS
+
+# Bit de la máscara para cada byte ASCII, para usar con bytes.translate()
+ASCII_MASK_TABLE = bytes(
+    MASK_LOWERCASE if chr(b) in ASCII_LOWERCASE
+    else MASK_UPPERCASE if chr(b) in ASCII_UPPERCASE
+    else MASK_DIGITS if chr(b) in ASCII_DIGITS
+    else MASK_SYMBOLS if chr(b) in ASCII_SYMBOLS
+    else 0
+    for b in range(256)
+)
+
+# Keyspace correspondiente a cada una de las 16 máscaras posibles
+KEYSPACE_BY_MASK = tuple(
+    (
+        (26 if mask & MASK_LOWERCASE else 0)    # a-z
+        + (26 if mask & MASK_UPPERCASE else 0)  # A-Z
+        + (10 if mask & MASK_DIGITS else 0)     # 0-9
+        + (32 if mask & MASK_SYMBOLS else 0)    # Símbolos comunes
+    ) or 1
+    for mask in range(16)
+)
+
+# log₂(N) precalculado para cada máscara
+LOG2_KEYSPACE_BY_MASK = tuple(math.log2(n) for n in KEYSPACE_BY_MASK)
+
+def get_composition_mask(password: str) -> int:
+    """
+    Obtiene la máscara de tipos de caracteres usados en la contraseña
+    
+    Las contraseñas ASCII se clasifican en C traduciendo cada byte a su bit
+    con ASCII_MASK_TABLE. En el resto, los caracteres ASCII se clasifican
+    por intersección de conjuntos y los demás siguen las reglas Unicode de
+    str.islower(), str.isupper(), str.isdigit() y str.isalnum().
+    
+    Args:
+        password (str): Contraseña a evaluar
+    
+    Returns:
+        int: Combinación de MASK_LOWERCASE, MASK_UPPERCASE, MASK_DIGITS y MASK_SYMBOLS
+    """
+    mask = 0
+    
+    if password.isascii():
+        bits = password.encode('ascii').translate(ASCII_MASK_TABLE)
+        for bit in (MASK_LOWERCASE, MASK_UPPERCASE, MASK_DIGITS, MASK_SYMBOLS):
+            if bit in bits:
+                mask |= bit
+        return mask
+    
+    chars = set(password)
+    if not ASCII_LOWERCASE.isdisjoint(chars):
+        mask |= MASK_LOWERCASE
+    if not ASCII_UPPERCASE.isdisjoint(chars):
+        mask |= MASK_UPPERCASE
+    if not ASCII_DIGITS.isdisjoint(chars):
+        mask |= MASK_DIGITS
+    if not ASCII_SYMBOLS.isdisjoint(chars):
+        mask |= MASK_SYMBOLS
+    
+    # Caracteres no ASCII (poco frecuentes)
+    for c in chars.difference(ASCII_CHARS):
+        if c.islower():
+            mask |= MASK_LOWERCASE
+        if c.isupper():
+            mask |= MASK_UPPERCASE
+        if c.isdigit():
+            mask |= MASK_DIGITS
+        if not c.isalnum():
+            mask |= MASK_SYMBOLS
+    
+    return mask
 
 # ============================================================================
 # FUNCIONES DE CÁLCULO BÁSICAS
@@ -35,25 +125,20 @@ def calculate_N(password: str) -> int:
     Returns:
         int: Tamaño del alfabeto
     """
-    keyspace = 0
-    
-    # Verificar presencia de diferentes tipos de caracteres
-    has_lowercase = any(c.islower() for c in password)
-    has_uppercase = any(c.isupper() for c in password)
-    has_digits = any(c.isdigit() for c in password)
-    has_symbols = any(not c.isalnum() for c in password)
+    return KEYSPACE_BY_MASK[get_composition_mask(password)]
+
+def compute_entropy(length: int, mask: int) -> float:
+    """
+    Calcula la entropía a partir de la longitud y la máscara de composición
     
-    # Sumar el tamaño de cada conjunto de caracteres utilizado
-    if has_lowercase:
-        keyspace += 26  # a-z
-    if has_uppercase:
-        keyspace += 26  # A-Z
-    if has_digits:
-        keyspace += 10  # 0-9
-    if has_symbols:
-        keyspace += 32  # Símbolos comunes
+    Args:
+        length (int): Longitud de la contraseña (L)
+        mask (int): Máscara de composición
     
-    return keyspace if keyspace > 0 else 1
+    Returns:
+        float: Entropía en bits (redondeado a 2 decimales)
+    """
+    return round(length * LOG2_KEYSPACE_BY_MASK[mask], 2)
 
 def calculate_entropy(password: str) -> float:
     """
@@ -65,19 +150,32 @@ def calculate_entropy(password: str) -> float:
     Returns:
         float: Entropía en bits (redondeado a 2 decimales)
     """
-    L = calculate_L(password)
-    N = calculate_N(password)
-    
-    if L == 0 or N == 0:
-        return 0.0
-    
-    entropy = L * math.log2(N)
-    return round(entropy, 2)
+    return compute_entropy(calculate_L(password), get_composition_mask(password))
 
 # ============================================================================
 # ANÁLISIS DE COMPOSICIÓN
 # ============================================================================
 
+def build_composition(length: int, mask: int) -> CompositionInfo:
+    """
+    Construye la información de composición a partir de la máscara
+    
+    Args:
+        length (int): Longitud de la contraseña
+        mask (int): Máscara de composición
+    
+    Returns:
+        CompositionInfo: Información detallada de la composición
+    """
+    return CompositionInfo.model_construct(
+        length=length,
+        has_lowercase=bool(mask & MASK_LOWERCASE),
+        has_uppercase=bool(mask & MASK_UPPERCASE),
+        has_digits=bool(mask & MASK_DIGITS),
+        has_symbols=bool(mask & MASK_SYMBOLS),
+        keyspace=KEYSPACE_BY_MASK[mask]
+    )
+
 def analyze_composition(password: str) -> CompositionInfo:
     """
     Analiza la composición de caracteres de la contraseña
@@ -88,19 +186,24 @@ def analyze_composition(password: str) -> CompositionInfo:
     Returns:
         CompositionInfo: Información detallada de la composición
     """
-    return CompositionInfo(
-        length=calculate_L(password),
-        has_lowercase=any(c.islower() for c in password),
-        has_uppercase=any(c.isupper() for c in password),
-        has_digits=any(c.isdigit() for c in password),
-        has_symbols=any(not c.isalnum() for c in password),
-        keyspace=calculate_N(password)
-    )
+    return build_composition(calculate_L(password), get_composition_mask(password))
 
 # ============================================================================
 # CÁLCULO DE TIEMPO DE CRACKEO
 # ============================================================================
 
+# Unidades de tiempo: (límite superior en segundos, divisor, unidad)
+CRACK_TIME_UNITS = (
+    (1, 0.001, "milisegundos"),
+    (60, 1, "segundos"),
+    (3600, 60, "minutos"),
+    (86400, 3600, "horas"),
+    (31536000, 86400, "días"),
+    (31536000000, 31536000, "años"),
+    (math.inf, 31536000000, "milenios"),
+)
+CRACK_TIME_LIMITS = tuple(limit for limit, _, _ in CRACK_TIME_UNITS[:-1])
+
 def calculate_crack_time(entropy: float) -> CrackTime:
     """
     Calcula el tiempo estimado para crackear la contraseña por fuerza bruta
@@ -113,29 +216,56 @@ def calculate_crack_time(entropy: float) -> CrackTime:
         CrackTime: Tiempo estimado en unidades legibles
     """
     attempts_per_second = 10**11  # 100 mil millones de intentos/segundo
-    total_combinations = 2**entropy
+    try:
+        total_combinations = 2.0**entropy
+    except OverflowError:
+        # Más de ~1024 bits: fuera del rango de un float
+        total_combinations = math.inf
     seconds = total_combinations / (2 * attempts_per_second)  # Dividido por 2 (promedio)
     
     # Convertir a unidades legibles
-    if seconds < 1:
-        return CrackTime(value=round(seconds * 1000, 2), unit="milisegundos")
-    elif seconds < 60:
-        return CrackTime(value=round(seconds, 2), unit="segundos")
-    elif seconds < 3600:
-        return CrackTime(value=round(seconds / 60, 2), unit="minutos")
-    elif seconds < 86400:
-        return CrackTime(value=round(seconds / 3600, 2), unit="horas")
-    elif seconds < 31536000:
-        return CrackTime(value=round(seconds / 86400, 2), unit="días")
-    elif seconds < 31536000000:
-        return CrackTime(value=round(seconds / 31536000, 2), unit="años")
-    else:
-        return CrackTime(value=round(seconds / 31536000000, 2), unit="milenios")
+    _, divisor, unit = CRACK_TIME_UNITS[bisect_right(CRACK_TIME_LIMITS, seconds)]
+    return CrackTime.model_construct(value=round(seconds / divisor, 2), unit=unit)
+
+# Tiempo de crackeo de las contraseñas del diccionario (entropía 0)
+DICTIONARY_CRACK_TIME = calculate_crack_time(0.0)
 
 # ============================================================================
 # EVALUACIÓN DE FORTALEZA
 # ============================================================================
 
+# Categorías por tramos de 20 bits: (strength, score, recommendation)
+# Los tramos 0-20 y 20-40 comparten la categoría "Muy Débil"
+VERY_WEAK_CATEGORY = (
+    "Muy Débil",
+    1,
+    "Aumenta la longitud y usa diferentes tipos de caracteres (mayúsculas, minúsculas, números, símbolos)."
+)
+STRENGTH_CATEGORIES = (
+    VERY_WEAK_CATEGORY,  # 0-20 bits
+    VERY_WEAK_CATEGORY,  # 20-40 bits
+    (
+        "Débil",
+        2,
+        "Considera agregar más caracteres y variar los tipos de caracteres utilizados."
+    ),
+    (
+        "Aceptable",
+        3,
+        "Contraseña razonable, pero podría mejorarse con mayor longitud o complejidad."
+    ),
+    (
+        "Fuerte",
+        4,
+        "Buena contraseña. Mantenla segura y no la reutilices en otros sitios."
+    ),
+    (
+        "Muy Fuerte",
+        5,
+        "Excelente contraseña. Asegúrate de almacenarla de forma segura."
+    ),
+)
+
 def get_strength_category(entropy: float) -> tuple[str, int, str]:
     """
     Determina la categoría de fortaleza basada en la entropía
@@ -146,36 +276,29 @@ def get_strength_category(entropy: float) -> tuple[str, int, str]:
     Returns:
         tuple: (strength, score, recommendation)
     """
-    if entropy < 40:
-        return (
-            "Muy Débil",
-            1,
-            "Aumenta la longitud y usa diferentes tipos de caracteres (mayúsculas, minúsculas, números, símbolos)."
-        )
-    elif entropy < 60:
-        return (
-            "Débil",
-            2,
-            "Considera agregar más caracteres y variar los tipos de caracteres utilizados."
-        )
-    elif entropy < 80:
-        return (
-            "Aceptable",
-            3,
-            "Contraseña razonable, pero podría mejorarse con mayor longitud o complejidad."
-        )
-    elif entropy < 100:
-        return (
-            "Fuerte",
-            4,
-            "Buena contraseña. Mantenla segura y no la reutilices en otros sitios."
-        )
-    else:
-        return (
-            "Muy Fuerte",
-            5,
-            "Excelente contraseña. Asegúrate de almacenarla de forma segura."
-        )
+    # Limitar a [0, 100] bits: a partir de 100 todo es "Muy Fuerte"
+    return STRENGTH_CATEGORIES[int(min(max(entropy, 0.0), 100.0)) // 20]
+
+# ============================================================================
+# CACHE DE EVALUACIONES
+# ============================================================================
+
+# Fuera del diccionario, la evaluación depende solo de la longitud y de la
+# máscara de composición, así que esa es la clave: no se guarda nada más de
+# la contraseña (ni un hash de ella) y no hay que calcular ningún hash por
+# petición. Con contraseñas de hasta 128 caracteres hay como mucho
+# 128 × 16 = 2.048 claves; a ~2,7KB por evaluación el tope es de ~6MB.
+# Si se llena, se descarta la entrada más antigua.
+EVALUATION_CACHE_MAXSIZE = 2048
+EVALUATION_CACHE: Dict[Tuple[int, int], PasswordEvaluation] = {}
+
+def clear_evaluation_cache() -> None:
+    """Descarta todas las evaluaciones guardadas en cache"""
+    EVALUATION_CACHE.clear()
+
+# ============================================================================
+# EVALUACIÓN COMPLETA
+# ============================================================================
 
 def evaluate_password(password: str) -> PasswordEvaluation:
     """
@@ -188,18 +311,73 @@ def evaluate_password(password: str) -> PasswordEvaluation:
     4. Calcula el tiempo de crackeo
     5. Genera recomendaciones
     
+    Las evaluaciones de contraseñas que no están en el diccionario se
+    guardan en cache por longitud y composición (ver EVALUATION_CACHE).
+    
     Args:
         password (str): Contraseña a evaluar
     
     Returns:
         PasswordEvaluation: Evaluación completa de la contraseña
     """
-    # Calcular entropía
-    entropy = calculate_entropy(password)
+    # Clasificar los caracteres una sola vez
+    length = len(password)
+    mask = get_composition_mask(password)
     
     # Verificar si está en el diccionario
-    is_common = is_common_password(password)
-    rank = get_password_rank(password) if is_common else None
+    rank = lookup_password_rank(password)
+    
+    # Si está en el diccionario, penalizar severamente (nunca se guarda en cache)
+    if rank is not None:
+        return PasswordEvaluation.model_construct(
+            strength="Muy Débil (En Diccionario)",
+            score=0,
+            entropy=0.0,
+            is_common=True,
+            rank=rank,
+            crack_time=DICTIONARY_CRACK_TIME,
+            composition=build_composition(length, mask),
+            recommendation=(
+                f"Esta contraseña está en el puesto #{rank:,} de las más comunes. "
+                "Es extremadamente predecible. Cámbiala inmediatamente."
+            )
+        )
+    
+    cache_key = (length, mask)
+    evaluation = EVALUATION_CACHE.get(cache_key)
+    if evaluation is not None:
+        return evaluation
+    
+    # Obtener entropía y categoría basada en entropía
+    entropy = compute_entropy(length, mask)
+    strength, score, recommendation = get_strength_category(entropy)
+    
+    # Construir respuesta (datos generados internamente: se omite la validación)
+    evaluation = PasswordEvaluation.model_construct(
+        strength=strength,
+        score=score,
+        entropy=entropy,
+        is_common=False,
+        rank=None,
+        crack_time=calculate_crack_time(entropy),
+        composition=build_composition(length, mask),
+        recommendation=recommendation
+    )
+    
+    # Guardar en cache, descartando la entrada más antigua si está llena
+    if len(EVALUATION_CACHE) >= EVALUATION_CACHE_MAXSIZE:
+        EVALUATION_CACHE.pop(next(iter(EVALUATION_CACHE)), None)
+    EVALUATION_CACHE[cache_key] = evaluation
+    
+    return evaluation
+    
+    # Clasificar los caracteres una sola vez
+    length = len(password)
+    mask = get_composition_mask(password)
+    
+    # Verificar si está en el diccionario
+    rank = lookup_password_rank(password)
+    is_common = rank is not None
     
     # Si está en el diccionario, penalizar severamente
     if is_common:
@@ -210,19 +388,18 @@ def evaluate_password(password: str) -> PasswordEvaluation:
             f"Esta contraseña está en el puesto #{rank:,} de las más comunes. "
             "Es extremadamente predecible. Cámbiala inmediatamente."
         )
+        crack_time = DICTIONARY_CRACK_TIME
     else:
-        # Obtener categoría basada en entropía
-        strength, score, recommendation = get_strength_category(entropy)
-        entropy_adjusted = entropy
+        # Obtener entropía y categoría basada en entropía
+        entropy_adjusted = compute_entropy(length, mask)
+        strength, score, recommendation = get_strength_category(entropy_adjusted)
+        crack_time = calculate_crack_time(entropy_adjusted)
     
     # Analizar composición
-    composition = analyze_composition(password)
+    composition = build_composition(length, mask)
     
-    # Calcular tiempo de crackeo
-    crack_time = calculate_crack_time(entropy_adjusted)
-    
-    # Construir respuesta
-    return PasswordEvaluation(
+    # Construir respuesta (datos generados internamente: se omite la validación)
+    evaluation = PasswordEvaluation.model_construct(
         strength=strength,
         score=score,
         entropy=entropy_adjusted,
@@ -231,4 +408,10 @@ def evaluate_password(password: str) -> PasswordEvaluation:
         crack_time=crack_time,
         composition=composition,
         recommendation=recommendation
-    )
\ No newline at end of file
+    )
+    
+    # Guardar en cache mientras haya espacio (nunca las del diccionario)
+    if not is_common and len(EVALUATION_CACHE) < EVALUATION_CACHE_MAXSIZE:
+        EVALUATION_CACHE[cache_key] = evaluation
+    
+    return evaluation
\ No newline at end of file